@@ -1,10 +1,17 @@
 import os
+import re
 import time
 import json
+import math
 import html
+import bisect
+import hashlib
+import heapq
 import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import requests
 import telebot
@@ -15,6 +22,9 @@ from telebot.apihelper import ApiTelegramException
                
                            
 DATA_FILE ="data.json"
+SEND_RATE_PER_SEC = 25
+DELIVERY_BATCH = 50
+DM_TARGET = "dm"
 BOT_TOKEN = "" # Put your token here
 
 if not BOT_TOKEN:
@@ -28,14 +38,22 @@ DEFAULT_DATA = {
         "interval_sec": 300,                                       
         "horizon_days": 14,                                          
         "min_weight": 0,                                            
-        "disable_web_preview": False
+        "disable_web_preview": False,
+        "source_timeout_sec": 30,
+        "channel_reminders": {},
+        "sources": [
+            {"type": "ctftime"}
+        ]
     },
     "state": {
         "running": False,
-        "last_run": None,                          
+        "last_run": None,
+        "reminders": [],
+        "outbox": [],                          
                                                                                                                     
         "events": {}
-    }
+    },
+    "subscriptions": {}
 }
 
 data_lock = threading.RLock()
@@ -43,6 +61,11 @@ bot = telebot.TeleBot(BOT_TOKEN, parse_mode="HTML", threaded=True)
 
 scheduler_thread: Optional[threading.Thread] = None
 scheduler_stop_flag = threading.Event()
+scheduler_wake = threading.Event()
+
+delivery_wake = threading.Event()
+delivery_thread: Optional[threading.Thread] = None
+subscription_index: Optional[Dict[str, List[Tuple[float, int]]]] = None
 
 
                            
@@ -176,6 +199,337 @@ def fetch_ctftime_events(start: datetime, finish: datetime, limit: int = 100) ->
         return []
 
 
+def _stable_id(prefix: str, *parts: str) -> str:
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}:{digest}"
+
+
+def _read_text(location: str, timeout: int = 20) -> str:
+    if location.startswith(("http://", "https://")):
+        r = requests.get(location, timeout=timeout)
+        r.raise_for_status()
+        return r.text
+    with open(location, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _unescape_ics_text(value: str) -> str:
+    return (value.replace("\\N", "\n").replace("\\n", "\n")
+                 .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def parse_ics_datetime(value: str, params: Dict[str, str]) -> datetime:
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d").replace(tzinfo=timezone.utc)
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    dt = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    tzid = params.get("TZID")
+    if tzid:
+        try:
+            from zoneinfo import ZoneInfo
+            return dt.replace(tzinfo=ZoneInfo(tzid)).astimezone(timezone.utc)
+        except Exception:
+            print(f"[WARN] Unknown ICS TZID {tzid!r}, assuming UTC")
+    # Floating local times carry no zone; treat them as UTC
+    return dt.replace(tzinfo=timezone.utc)
+
+
+def parse_ics_events(text: str, location: str = "") -> List[Dict[str, Any]]:
+    # Unfold continuation lines (RFC 5545 3.1)
+    lines: List[str] = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+
+    events = []
+    current: Optional[Dict[str, Tuple[Dict[str, str], str]]] = None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            current = {}
+            continue
+        if line == "END:VEVENT":
+            if current is not None:
+                events.append(current)
+            current = None
+            continue
+        if current is None or ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, *param_parts = head.split(";")
+        params = {}
+        for p in param_parts:
+            if "=" in p:
+                k, v = p.split("=", 1)
+                params[k.upper()] = v.strip('"')
+        current.setdefault(name.upper(), (params, value))
+
+    parsed = []
+    for props in events:
+        try:
+            if "DTSTART" not in props:
+                continue
+            start_params, start_value = props["DTSTART"]
+            start = parse_ics_datetime(start_value, start_params)
+            if "DTEND" in props:
+                finish = parse_ics_datetime(props["DTEND"][1], props["DTEND"][0])
+            elif start_params.get("VALUE") == "DATE" or len(start_value.strip()) == 8:
+                finish = start + timedelta(days=1)
+            else:
+                finish = start
+            title = _unescape_ics_text(props.get("SUMMARY", ({}, "Untitled"))[1])
+            uid = props.get("UID", ({}, ""))[1].strip()
+            organizer = props.get("ORGANIZER")
+            organizers = []
+            if organizer and organizer[0].get("CN"):
+                organizers.append({"name": organizer[0]["CN"]})
+            parsed.append({
+                "id": _stable_id("ics", location, uid) if uid else _stable_id("ics", location, title, to_utc_iso(start)),
+                "title": title,
+                "start": to_utc_iso(start),
+                "finish": to_utc_iso(finish),
+                "url": props.get("URL", ({}, ""))[1].strip(),
+                "ctftime_url": "",
+                "weight": 0,
+                "onsite": False,
+                "organizers": organizers
+            })
+        except ValueError as e:
+            print(f"[WARN] Skipping malformed ICS event: {e}")
+    return parsed
+
+
+def fetch_ics_events(location: str) -> List[Dict[str, Any]]:
+    return parse_ics_events(_read_text(location), location)
+
+
+def fetch_json_feed_events(location: str) -> List[Dict[str, Any]]:
+    payload = json.loads(_read_text(location))
+    if isinstance(payload, dict):
+        payload = payload.get("events", [])
+    if not isinstance(payload, list):
+        return []
+    events = []
+    for item in payload:
+        if not isinstance(item, dict):
+            continue
+        ev = dict(item)
+        # Namespace ids per feed so private events never collide with CTFtime
+        # ids or with another feed that reuses the same numbering
+        raw_id = ev.get("id")
+        if raw_id is not None:
+            ev["id"] = _stable_id("json", location, str(raw_id))
+        else:
+            ev["id"] = _stable_id("json", location, str(ev.get("title", "")), str(ev.get("start", ev.get("starts", ""))))
+        events.append(ev)
+    return events
+
+
+SOURCE_ADAPTERS: Dict[str, Callable[[Dict[str, Any], datetime, datetime], List[Dict[str, Any]]]] = {
+    "ctftime": lambda spec, start, finish: fetch_ctftime_events(start, finish, limit=100),
+    "ics": lambda spec, start, finish: fetch_ics_events(spec["location"]),
+    "json": lambda spec, start, finish: fetch_json_feed_events(spec["location"]),
+}
+
+# Lower wins when the same event comes from several sources
+SOURCE_PRIORITY = {"ctftime": 0, "json": 1, "ics": 2}
+
+
+def source_name(spec: Dict[str, Any]) -> str:
+    if spec.get("location"):
+        return f"{spec.get('type')}:{spec['location']}"
+    return str(spec.get("type"))
+
+
+def _run_source(spec: Dict[str, Any], start: datetime, finish: datetime) -> List[Dict[str, Any]]:
+    adapter = SOURCE_ADAPTERS[spec["type"]]
+    return adapter(spec, start, finish)
+
+
+def stream_source_events(sources: List[Dict[str, Any]], start: datetime, finish: datetime,
+                         timeout: float = 30) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    specs = [s for s in sources if s.get("type") in SOURCE_ADAPTERS]
+    for s in sources:
+        if s.get("type") not in SOURCE_ADAPTERS:
+            print(f"[WARN] Unknown source type: {s.get('type')}")
+    if not specs:
+        return
+
+    specs.sort(key=lambda spec: source_priority(spec["type"]))
+
+    executor = ThreadPoolExecutor(max_workers=len(specs), thread_name_prefix="source")
+    futures = [(spec, executor.submit(_run_source, spec, start, finish)) for spec in specs]
+    try:
+        # The deadline covers fetching only, not the time the consumer spends posting
+        done, not_done = wait([fut for _, fut in futures], timeout=timeout)
+    finally:
+        # Do not block on stalled sources; their threads finish on their own timeouts
+        executor.shutdown(wait=False)
+    if not_done:
+        stalled = [source_name(spec) for spec, fut in futures if fut in not_done]
+        print(f"[WARN] Sources timed out after {timeout}s, skipping: {', '.join(stalled)}")
+
+    # Yield in priority order so dedup keeps the most authoritative copy
+    for spec, fut in futures:
+        if fut not in done:
+            continue
+        try:
+            events = fut.result()
+        except Exception as e:
+            print(f"[WARN] Source {source_name(spec)} failed: {e}")
+            continue
+        for ev in events or []:
+            yield source_name(spec), ev
+
+
+def _safe_url(value: Any) -> str:
+    # Telegram rejects the whole message if a button URL is not http(s)
+    url = str(value or "").strip()
+    return url if url.lower().startswith(("http://", "https://")) else ""
+
+
+def normalize_event(raw: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+    if not isinstance(raw, dict):
+        return None
+    ev = dict(raw)
+    if "start" not in ev and "starts" in ev:
+        ev["start"] = ev["starts"]
+    if "finish" not in ev and "finishes" in ev:
+        ev["finish"] = ev["finishes"]
+    if ev.get("id") is None or not ev.get("start"):
+        return None
+    try:
+        ev_start = parse_iso(str(ev["start"]))
+        ev_end = parse_iso(str(ev["finish"])) if ev.get("finish") else ev_start
+    except (TypeError, ValueError):
+        return None
+    if ev_end < ev_start:
+        ev_end = ev_start
+    # Feeds are hand-written; coerce every field the builders rely on so a bad
+    # item is dropped here instead of failing later in the cycle.
+    try:
+        weight = float(safe_get(ev, "weight", 0) or 0)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(weight):
+        return None
+    organizers = ev.get("organizers")
+    ev["organizers"] = [
+        {"name": str(org["name"])}
+        for org in (organizers if isinstance(organizers, list) else [])
+        if isinstance(org, dict) and org.get("name")
+    ]
+    ev["id"] = str(ev["id"])
+    ev["title"] = str(safe_get(ev, "title", "Untitled"))
+    ev["url"] = _safe_url(ev.get("url"))
+    ev["ctftime_url"] = _safe_url(ev.get("ctftime_url"))
+    ev["onsite"] = bool(ev.get("onsite", False))
+    ev["weight"] = weight
+    ev["start"] = to_utc_iso(ev_start)
+    ev["finish"] = to_utc_iso(ev_end)
+    ev["source"] = source
+    return ev
+
+
+def normalize_events(stream: Iterable[Tuple[str, Dict[str, Any]]], finish: datetime) -> Iterator[Dict[str, Any]]:
+    for source, raw in stream:
+        ev = normalize_event(raw, source)
+        if ev is None:
+            label = raw.get("title", raw.get("id")) if isinstance(raw, dict) else raw
+            print(f"[WARN] Dropping malformed event from {source}: {label!r}")
+            continue
+        # Only the horizon is enforced here: ended events must still reach
+        # run_cycle so tracked posts get their "Ended" edit.
+        if parse_iso(ev["start"]) > finish:
+            continue
+        yield ev
+
+
+def filter_min_weight(stream: Iterable[Dict[str, Any]], min_weight: float) -> Iterator[Dict[str, Any]]:
+    for ev in stream:
+        if ev["weight"] >= min_weight:
+            yield ev
+
+
+def event_dedup_key(event: Dict[str, Any]) -> str:
+    title = " ".join(re.findall(r"\w+", str(event.get("title", "")).casefold()))
+    return f"{title}|{event['start']}"
+
+
+def source_priority(source: str) -> int:
+    return SOURCE_PRIORITY.get(source.split(":", 1)[0], len(SOURCE_PRIORITY))
+
+
+def dedup_events(stream: Iterable[Dict[str, Any]], known_events: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    # The first id ever tracked for an event stays canonical, so an event seen
+    # from several sources keeps one post regardless of which source answers first.
+    # Copies are resolved by source id first (aliases), then by any key the event
+    # has had. A copy that is not the event's primary (highest-priority) source
+    # and disagrees on the start time is stale and skipped.
+    aliases = {
+        alias: ev_id
+        for ev_id, ev_state in known_events.items()
+        for alias in ev_state.get("aliases", [])
+    }
+    canonical = {
+        key: ev_id
+        for ev_id, ev_state in known_events.items()
+        for key in ev_state.get("dedup_keys", [])
+    }
+    seen_keys = set()
+    seen_ids = set()
+    for ev in stream:
+        key = event_dedup_key(ev)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        ev["dedup_key"] = key
+        source_id = ev["source_id"] = ev["id"]
+        canonical_id = aliases.get(source_id) or canonical.get(key)
+        if canonical_id:
+            tracked = known_events.get(canonical_id, {})
+            tracked_start = tracked.get("starts_at")
+            if (source_id != tracked.get("primary_id", canonical_id) and tracked_start
+                    and parse_iso(tracked_start) != parse_iso(ev["start"])):
+                continue
+            ev["id"] = canonical_id
+        if ev["id"] in seen_ids:
+            continue
+        seen_ids.add(ev["id"])
+        yield ev
+
+
+def remember_event_identity(ev_state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    key = event.get("dedup_key")
+    keys = ev_state.setdefault("dedup_keys", [])
+    if key and key not in keys:
+        keys.append(key)
+    source_id = event.get("source_id")
+    if not source_id:
+        return
+    aliases = ev_state.setdefault("aliases", [])
+    if source_id not in aliases:
+        aliases.append(source_id)
+    source = event.get("source", "")
+    if ("primary_id" not in ev_state
+            or source_priority(source) < source_priority(ev_state.get("primary_source", ""))):
+        ev_state["primary_id"] = source_id
+        ev_state["primary_source"] = source
+
+
+def ingest_events(d: Dict[str, Any], start: datetime, finish: datetime) -> Iterator[Dict[str, Any]]:
+    sources = d["settings"].get("sources") or [{"type": "ctftime"}]
+    timeout = float(d["settings"].get("source_timeout_sec", 30))
+    min_weight = float(d["settings"].get("min_weight", 0))
+    stream = stream_source_events(sources, start, finish, timeout=timeout)
+    # Filter before dedup so a low-weight feed copy cannot shadow the CTFtime one
+    stream = filter_min_weight(normalize_events(stream, finish), min_weight)
+    return dedup_events(stream, d["state"]["events"])
+
+
                            
            
                            
@@ -195,6 +549,11 @@ def build_event_text(event: Dict[str, Any], status: str) -> str:
             if name:
                 orgs.append(name)
     organizers = ", ".join(orgs) if orgs else "N/A"
+    links = []
+    if ctftime_url:
+        links.append(f'<a href="{html.escape(ctftime_url)}">View on CTFtime</a>')
+    if url and url != ctftime_url:
+        links.append(f'<a href="{html.escape(url)}">Website</a>')
 
                   
     if status == "upcoming":
@@ -225,7 +584,7 @@ def build_event_text(event: Dict[str, Any], status: str) -> str:
         f"Weight: <b>{weight}</b>",
         f"Organizers: <i>{html.escape(organizers)}</i>",
         "",
-        f'<a href="{html.escape(ctftime_url)}">View on CTFtime</a>' + (f' • <a href="{html.escape(url)}">Website</a>' if url and url != ctftime_url else "")
+        " • ".join(links)
     ]
 
     n = now_utc()
@@ -290,10 +649,387 @@ def remove_channel(d: Dict[str, Any], channel: str) -> bool:
             msgs = ev.get("messages", {})
             if channel in msgs:
                 msgs.pop(channel, None)
+            cancel_reminders(ev, channel)
+        d["settings"].get("channel_reminders", {}).pop(channel, None)
         return True
     return False
 
 
+def parse_duration_minutes(s: str) -> Optional[int]:
+    m = re.fullmatch(r"\s*(\d+)\s*([dhm]?)\s*", s.lower())
+    if not m:
+        return None
+    value = int(m.group(1))
+    unit = m.group(2) or "m"
+    minutes = value * {"d": 1440, "h": 60, "m": 1}[unit]
+    return minutes if minutes > 0 else None
+
+
+def fmt_minutes(minutes: int) -> str:
+    if minutes % 1440 == 0:
+        return f"{minutes // 1440}d"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}h"
+    return f"{minutes}m"
+
+
+def subscription_index_keys(sub: Dict[str, Any]) -> List[str]:
+    keys = []
+    if sub.get("new_events", True):
+        keys.append("new")
+    for lead in sub.get("remind_before", []):
+        keys.append(f"before:{int(lead)}")
+    return keys
+
+
+def build_subscription_index(subs: Dict[str, Any]) -> Dict[str, List[Tuple[float, int]]]:
+    index: Dict[str, List[Tuple[float, int]]] = {}
+    for user_id, sub in subs.items():
+        entry = (float(sub.get("min_weight", 0)), int(user_id))
+        for key in subscription_index_keys(sub):
+            index.setdefault(key, []).append(entry)
+    for entries in index.values():
+        entries.sort()
+    return index
+
+
+def get_subscription_index(d: Dict[str, Any]) -> Dict[str, List[Tuple[float, int]]]:
+    global subscription_index
+    with data_lock:
+        if subscription_index is None:
+            subscription_index = build_subscription_index(d.get("subscriptions", {}))
+        return subscription_index
+
+
+def _index_remove(d: Dict[str, Any], user_id: int, sub: Dict[str, Any]) -> None:
+    index = get_subscription_index(d)
+    entry = (float(sub.get("min_weight", 0)), user_id)
+    for key in subscription_index_keys(sub):
+        entries = index.get(key, [])
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            entries.pop(i)
+        if not entries:
+            index.pop(key, None)
+
+
+def _index_add(d: Dict[str, Any], user_id: int, sub: Dict[str, Any]) -> None:
+    index = get_subscription_index(d)
+    entry = (float(sub.get("min_weight", 0)), user_id)
+    for key in subscription_index_keys(sub):
+        bisect.insort(index.setdefault(key, []), entry)
+
+
+def resolve_subscribers(d: Dict[str, Any], key: str, weight: float) -> List[int]:
+    # Entries are sorted by min_weight, so matching users form a prefix: O(log n + k)
+    entries = get_subscription_index(d).get(key, [])
+    cut = bisect.bisect_right(entries, (weight, float("inf")))
+    return [user_id for _, user_id in entries[:cut]]
+
+
+def active_reminder_leads(d: Dict[str, Any]) -> List[int]:
+    return sorted(int(key.split(":", 1)[1]) for key, entries in get_subscription_index(d).items()
+                  if key.startswith("before:") and entries)
+
+
+@with_data
+def subscribe_user(d: Dict[str, Any], user_id: int, min_weight: Optional[float] = None) -> bool:
+    get_subscription_index(d)  # build from the pre-change state before mutating it
+    subs = d.setdefault("subscriptions", {})
+    existing = subs.get(str(user_id))
+    sub = dict(existing) if existing else {"min_weight": 0, "new_events": True, "remind_before": []}
+    if min_weight is not None:
+        sub["min_weight"] = min_weight
+    leads_before = set(active_reminder_leads(d))
+    if existing:
+        _index_remove(d, user_id, existing)
+    subs[str(user_id)] = sub
+    _index_add(d, user_id, sub)
+    _schedule_new_dm_leads(d, leads_before)
+    return existing is None
+
+
+@with_data
+def unsubscribe_user(d: Dict[str, Any], user_id: int) -> bool:
+    get_subscription_index(d)  # build from the pre-change state before mutating it
+    sub = d.setdefault("subscriptions", {}).pop(str(user_id), None)
+    if sub is None:
+        return False
+    _index_remove(d, user_id, sub)
+    return True
+
+
+@with_data
+def update_subscription(d: Dict[str, Any], user_id: int, **changes: Any) -> Optional[Dict[str, Any]]:
+    get_subscription_index(d)  # build from the pre-change state before mutating it
+    subs = d.setdefault("subscriptions", {})
+    existing = subs.get(str(user_id))
+    if existing is None:
+        return None
+    sub = dict(existing)
+    sub.update(changes)
+    leads_before = set(active_reminder_leads(d))
+    _index_remove(d, user_id, existing)
+    subs[str(user_id)] = sub
+    _index_add(d, user_id, sub)
+    _schedule_new_dm_leads(d, leads_before)
+    return sub
+
+
+def _schedule_new_dm_leads(d: Dict[str, Any], leads_before: Set[int]) -> None:
+    # Leads nobody used before have no heap entries yet; dropped leads need no
+    # cleanup since their entries resolve to no recipients when they fire.
+    new_leads = [lead for lead in active_reminder_leads(d) if lead not in leads_before]
+    if not new_leads:
+        return
+    n = now_utc()
+    for event_id, ev_state in d["state"]["events"].items():
+        if ev_state.get("status") == "upcoming" and DM_TARGET in ev_state.get("reminders", {}):
+            schedule_reminders(d, event_id, DM_TARGET, n, leads=new_leads)
+
+
+class RateLimiter:
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+send_limiter = RateLimiter(SEND_RATE_PER_SEC)
+
+
+def send_with_retry(chat_id: Any, text: str, reply_markup=None, disable_preview: bool = False,
+                    retries: int = 3, **kwargs):
+    for attempt in range(retries):
+        send_limiter.wait()
+        try:
+            return bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                reply_markup=reply_markup,
+                disable_web_page_preview=disable_preview,
+                **kwargs
+            )
+        except ApiTelegramException as te:
+            if te.error_code != 429 or attempt == retries - 1:
+                raise
+            retry_after = (te.result_json or {}).get("parameters", {}).get("retry_after", 1)
+            print(f"[WARN] Rate limited sending to {chat_id}, retrying in {retry_after}s")
+            time.sleep(retry_after)
+
+
+def delivery_loop():
+    # DM fan-outs live in state.outbox so a restart resumes them from the saved
+    # cursor; at most one batch may be delivered twice after a crash.
+    while True:
+        try:
+            delivery_wake.clear()
+            with data_lock:
+                outbox = load_data()["state"].get("outbox", [])
+                job = outbox[0] if outbox else None
+            if job is None:
+                delivery_wake.wait(60)
+                continue
+            batch = job["recipients"][job["cursor"]:job["cursor"] + DELIVERY_BATCH]
+            blocked = []
+            for chat_id in batch:
+                try:
+                    send_with_retry(chat_id, job["text"], reply_markup=job.get("markup"),
+                                    disable_preview=job.get("disable_preview", False))
+                except ApiTelegramException as te:
+                    if te.error_code == 403:
+                        blocked.append((chat_id, te.description))
+                    else:
+                        print(f"[WARN] Failed to deliver DM to {chat_id}: {te}")
+                except Exception as e:
+                    print(f"[WARN] Unexpected DM error to {chat_id}: {e}")
+            advance_outbox(job["id"], len(batch))
+            for chat_id, reason in blocked:
+                # Blocked the bot or deactivated: stop sending to this user
+                unsubscribe_user(chat_id)
+                print(f"[INFO] Pruned subscriber {chat_id}: {reason}")
+        except Exception as e:
+            print(f"[ERROR] Delivery loop exception: {e}")
+            time.sleep(10)
+
+
+@with_data
+def advance_outbox(d: Dict[str, Any], job_id: str, count: int) -> None:
+    outbox = d["state"].setdefault("outbox", [])
+    for i, job in enumerate(outbox):
+        if job["id"] == job_id:
+            job["cursor"] += count
+            if job["cursor"] >= len(job["recipients"]):
+                outbox.pop(i)
+            return
+
+
+def ensure_delivery_running():
+    global delivery_thread
+    if delivery_thread and delivery_thread.is_alive():
+        return
+    delivery_thread = threading.Thread(target=delivery_loop, daemon=True)
+    delivery_thread.start()
+
+
+def enqueue_dms(d: Dict[str, Any], user_ids: Iterable[int], text: str, markup=None) -> int:
+    recipients = list(user_ids)
+    if not recipients:
+        return 0
+    d["state"].setdefault("outbox", []).append({
+        "id": uuid.uuid4().hex,
+        "text": text,
+        "markup": markup.to_json() if markup else None,
+        "disable_preview": d["settings"].get("disable_web_preview", False),
+        "recipients": recipients,
+        "cursor": 0
+    })
+    ensure_delivery_running()
+    delivery_wake.set()
+    return len(recipients)
+
+
+def notify_subscribers(d: Dict[str, Any], event: Dict[str, Any], status: str, now: datetime) -> None:
+    ev_state = d["state"]["events"].get(str(event["id"]))
+    if ev_state is None:
+        return
+    weight = float(safe_get(event, "weight", 0) or 0)
+    markup = build_event_markup(event)
+
+    if not ev_state.get("dm_announced"):
+        recipients = resolve_subscribers(d, "new", weight)
+        sent = enqueue_dms(d, recipients, build_event_text(event, status), markup)
+        ev_state["dm_announced"] = True
+        if sent:
+            print(f"[INFO] Queued event {event['id']} for {sent} subscribers")
+
+    # DM reminders go through the same persistent heap as channel reminders
+    ev_state["weight"] = weight
+    if status == "upcoming" and DM_TARGET not in ev_state.get("reminders", {}):
+        schedule_reminders(d, str(event["id"]), DM_TARGET, now)
+
+
+def schedule_reminders(d: Dict[str, Any], event_id: str, target: str, now: datetime,
+                       leads: Optional[List[int]] = None) -> int:
+    ev_state = d["state"]["events"][event_id]
+    starts_at = ev_state["starts_at"]
+    start = parse_iso(starts_at)
+    reminders = ev_state.setdefault("reminders", {})
+    if leads is None:
+        if target == DM_TARGET:
+            leads = active_reminder_leads(d)
+        else:
+            leads = d["settings"].get("channel_reminders", {}).get(str(target), [])
+        # Overwriting the pending map invalidates any heap entries for an older start time
+        reminders[str(target)] = {}
+    pending = reminders.setdefault(str(target), {})
+    heap = d["state"].setdefault("reminders", [])
+    scheduled = 0
+    for lead in leads:
+        fire_at = start - timedelta(minutes=int(lead))
+        if fire_at <= now:
+            continue
+        pending[str(lead)] = starts_at
+        heapq.heappush(heap, [int(fire_at.timestamp()), event_id, str(target), int(lead), starts_at])
+        scheduled += 1
+    if scheduled:
+        # The scheduler may be asleep until the next fetch; let it pick up the new head
+        scheduler_wake.set()
+    return len(pending)
+
+
+def cancel_reminders(ev_state: Dict[str, Any], channel: Optional[str] = None) -> None:
+    if channel is None:
+        ev_state.pop("reminders", None)
+    else:
+        ev_state.get("reminders", {}).pop(str(channel), None)
+
+
+def build_reminder_text(ev_state: Dict[str, Any], now: datetime) -> str:
+    title = html.escape(ev_state.get("title") or "CTF")
+    start = parse_iso(ev_state["starts_at"])
+    # Use the real time left: a reminder may fire late after downtime
+    delta = start - now
+    h = int(delta.total_seconds() // 3600)
+    m = int((delta.total_seconds() % 3600) // 60)
+    return (
+        f"⏰ <b>{title}</b> starts in ~ {h}h {m}m\n"
+        f"Starts: <b>{fmt_dt(start)}</b>"
+    )
+
+
+@with_data
+def fire_due_reminders(d: Dict[str, Any]) -> Optional[int]:
+    heap = d["state"].setdefault("reminders", [])
+    n = now_utc()
+    now_ts = n.timestamp()
+    due: Dict[Tuple[str, str], List[int]] = {}
+    while heap and heap[0][0] <= now_ts:
+        _, event_id, channel, lead, starts_at = heapq.heappop(heap)
+        ev_state = d["state"]["events"].get(event_id)
+        if not ev_state:
+            continue
+        pending = ev_state.get("reminders", {}).get(channel, {})
+        # Cancelled or moved reminders are dropped lazily here
+        if pending.get(str(lead)) != starts_at:
+            continue
+        pending.pop(str(lead))
+        if parse_iso(starts_at) > n:
+            due.setdefault((event_id, channel), []).append(lead)
+
+    # After downtime several leads can be due at once; only the closest one is sent
+    for (event_id, channel), leads in due.items():
+        ev_state = d["state"]["events"][event_id]
+        lead = min(leads)
+        if channel == DM_TARGET:
+            weight = float(ev_state.get("weight", 0))
+            # A user due for several leads at once gets a single DM
+            recipients = set()
+            for due_lead in leads:
+                recipients.update(resolve_subscribers(d, f"before:{due_lead}", weight))
+            sent = enqueue_dms(d, sorted(recipients), build_reminder_text(ev_state, n))
+            if sent:
+                print(f"[INFO] Queued reminder for event {event_id} to {sent} subscribers")
+            continue
+        message_id = ev_state.get("messages", {}).get(channel)
+        if message_id is None:
+            continue
+        try:
+            send_with_retry(
+                channel,
+                build_reminder_text(ev_state, n),
+                disable_preview=True,
+                reply_to_message_id=message_id,
+                allow_sending_without_reply=True
+            )
+            print(f"[INFO] Sent {fmt_minutes(lead)} reminder for event {event_id} to {channel}")
+        except ApiTelegramException as te:
+            print(f"[WARN] Reminder failed for {channel}:{message_id} - {te}")
+        except Exception as e:
+            print(f"[WARN] Unexpected reminder error for {channel}:{message_id} - {e}")
+    return heap[0][0] if heap else None
+
+
+def reschedule_event(d: Dict[str, Any], event: Dict[str, Any], now: datetime) -> None:
+    event_id = str(event["id"])
+    ev_state = d["state"]["events"][event_id]
+    ev_state["starts_at"] = event["start"]
+    ev_state["ends_at"] = event["finish"]
+    remember_event_identity(ev_state, event)
+    for channel in ev_state.get("messages", {}):
+        schedule_reminders(d, event_id, channel, now)
+    schedule_reminders(d, event_id, DM_TARGET, now)
+    print(f"[INFO] Event {event_id} moved to {event['start']}, reminders rescheduled")
+
+
 def post_event_to_channels(d: Dict[str, Any], event: Dict[str, Any], status: str) -> None:
     text = build_event_text(event, status)
     markup = build_event_markup(event)
@@ -304,24 +1040,23 @@ def post_event_to_channels(d: Dict[str, Any], event: Dict[str, Any], status: str
         "status": status,
         "starts_at": event["start"],
         "ends_at": event["finish"],
+        "title": event.get("title"),
         "messages": {}
     })
+    remember_event_identity(ev_state, event)
 
     for channel in d["channels"]:
                                                 
         if str(channel) in ev_state["messages"]:
             continue
         try:
-            msg = bot.send_message(
-                chat_id=channel,
-                text=text,
-                reply_markup=markup,
-                disable_web_page_preview=disable_preview
-            )
+            msg = send_with_retry(channel, text, reply_markup=markup, disable_preview=disable_preview)
             ev_state["messages"][str(channel)] = msg.message_id
             ev_state["status"] = status
             ev_state["starts_at"] = event["start"]
             ev_state["ends_at"] = event["finish"]
+            ev_state["title"] = event.get("title")
+            schedule_reminders(d, event_id, str(channel), now_utc())
             print(f"[INFO] Posted event {event_id} to {channel} (msg {msg.message_id})")
         except ApiTelegramException as te:
             print(f"[WARN] Failed to send to {channel}: {te}")
@@ -365,27 +1100,16 @@ def edit_event_messages(d: Dict[str, Any], event: Dict[str, Any], new_status: st
     ev_state["status"] = new_status
     ev_state["starts_at"] = event["start"]
     ev_state["ends_at"] = event["finish"]
+    remember_event_identity(ev_state, event)
+    ev_state["title"] = event.get("title")
 
 
 @with_data
 def run_cycle(d: Dict[str, Any]) -> None:
     start = now_utc()
     finish = start + timedelta(days=int(d["settings"].get("horizon_days", 14)))
-    min_weight = int(d["settings"].get("min_weight", 0))
 
-    events = fetch_ctftime_events(start, finish, limit=100)
-                                      
-    for ev in events:
-                                                                
-        if "start" not in ev and "starts" in ev:
-            ev["start"] = ev["starts"]
-        if "finish" not in ev and "finishes" in ev:
-            ev["finish"] = ev["finishes"]
-
-                      
-    filtered = [ev for ev in events if float(safe_get(ev, "weight", 0) or 0) >= min_weight]
-
-    for ev in filtered:
+    for ev in ingest_events(d, start, finish):
         try:
             ev_id = str(ev["id"])
             ev_start = parse_iso(ev["start"])
@@ -398,8 +1122,15 @@ def run_cycle(d: Dict[str, Any]) -> None:
                                                                              
                 if status_now in ("upcoming", "running"):
                     post_event_to_channels(d, ev, status_now)
+                    notify_subscribers(d, ev, status_now, start)
                 continue
 
+            remember_event_identity(known, ev)
+            if known.get("starts_at") and parse_iso(known["starts_at"]) != ev_start:
+                reschedule_event(d, ev, start)
+                if known.get("messages"):
+                    edit_event_messages(d, ev, status_now)
+
                                                             
             prev_status = known.get("status", "upcoming")
             if status_now != prev_status:
@@ -414,6 +1145,7 @@ def run_cycle(d: Dict[str, Any]) -> None:
                                                                                                               
             if status_now in ("upcoming", "running"):
                 post_event_to_channels(d, ev, status_now)
+                notify_subscribers(d, ev, status_now, start)
 
         except Exception as e:
             print(f"[WARN] Error processing event: {e}")
@@ -422,15 +1154,26 @@ def run_cycle(d: Dict[str, Any]) -> None:
 
 
 def scheduler_loop():
+    next_cycle = 0.0
     while not scheduler_stop_flag.is_set():
         try:
+            scheduler_wake.clear()
             with data_lock:
                 d = load_data()
                 running = d["state"].get("running", False)
                 interval = int(d["settings"].get("interval_sec", 300))
-            if running:
+            if not running:
+                scheduler_wake.wait(max(5, interval))
+                continue
+            if time.time() >= next_cycle:
                 run_cycle()                                
-            time.sleep(max(5, interval))
+                next_cycle = time.time() + max(5, interval)
+            # Wake for whichever comes first: the next fetch or the earliest reminder
+            wake_at = next_cycle
+            next_reminder = fire_due_reminders()
+            if next_reminder is not None:
+                wake_at = min(wake_at, next_reminder)
+            scheduler_wake.wait(max(1.0, wake_at - time.time()))
         except KeyboardInterrupt:
             break
         except Exception as e:
@@ -461,9 +1204,18 @@ def cmd_start(message: types.Message):
         "/addchannel id_or_@username - Add a channel\n"
         "/removechannel id_or_@username - Remove a channel\n"
         "/listchannels - List channels\n"
+        "/setreminders id_or_@username 24h 1h 10m|off - Pre-start reminders for a channel\n"
         "/setinterval seconds - Set fetch interval\n"
         "/sethorizon days - Set upcoming horizon\n"
         "/setminweight weight - Set minimum CTFtime weight\n"
+        "/addsource ics|json path_or_url - Add an event source\n"
+        "/removesource ctftime|path_or_url - Remove an event source\n"
+        "/listsources - List event sources\n\n"
+        "Personal DMs:\n"
+        "/subscribe [min_weight] - Get CTF announcements by DM\n"
+        "/unsubscribe - Stop DMs\n"
+        "/prefs - Show your preferences\n"
+        "/setprefs weight|before|new value - Change preferences\n"
     ))
 
 
@@ -471,11 +1223,14 @@ def cmd_start(message: types.Message):
 def cmd_help(message: types.Message):
     bot.reply_to(message, (
         "<b>CTFtime Telegram Bot</b>\n"
-        "• Adds upcoming CTFs from CTFtime to your channels.\n"
+        "• Adds upcoming CTFs from CTFtime, iCal files and JSON feeds to your channels.\n"
         "• Edits messages when events start (Running) and end (Ended).\n"
+        "• Replies to posts with reminders before events start (/setreminders).\n"
         "• HTML-rich formatting with buttons and calendar links.\n\n"
         "<b>Admin-only Controls</b>\n"
-        "/control • /run • /stop • /status • /addchannel • /removechannel • /listchannels • /setinterval • /sethorizon • /setminweight\n\n"
+        "/control • /run • /stop • /status • /addchannel • /removechannel • /listchannels • /setreminders • /setinterval • /sethorizon • /setminweight • /addsource • /removesource • /listsources\n\n"
+        "<b>Personal DMs</b>\n"
+        "/subscribe • /unsubscribe • /prefs • /setprefs — e.g. <code>/setprefs before 1h</code> and <code>/setprefs weight 50</code>\n\n"
         "Make sure the bot is an admin in target channels to post and edit messages."
     ))
 
@@ -488,6 +1243,7 @@ def cmd_run(message: types.Message):
         d["state"]["running"] = True
     _run()
     ensure_scheduler_running()
+    scheduler_wake.set()
     bot.reply_to(message, "Scheduler started. I will post/refresh events periodically.")
 
 
@@ -513,6 +1269,9 @@ def cmd_status(message: types.Message):
     minw = d["settings"].get("min_weight", 0)
     channels = d["channels"]
     events_count = len(d["state"].get("events", {}))
+    sources = d["settings"].get("sources") or [{"type": "ctftime"}]
+    subscribers = len(d.get("subscriptions", {}))
+    queued_dms = sum(len(job["recipients"]) - job["cursor"] for job in d["state"].get("outbox", []))
     bot.reply_to(message, (
         f"<b>Status</b>\n"
         f"Running: <b>{running}</b>\n"
@@ -521,6 +1280,10 @@ def cmd_status(message: types.Message):
         f"Horizon: <b>{horizon} days</b>\n"
         f"Min weight: <b>{minw}</b>\n"
         f"Channels: <b>{len(channels)}</b>\n"
+        f"Sources: <b>{len(sources)}</b>\n"
+        f"Subscribers: <b>{subscribers}</b>\n"
+        f"Queued DMs: <b>{queued_dms}</b>\n"
+        f"Queued reminders: <b>{len(d['state'].get('reminders', []))}</b>\n"
         f"Tracked events: <b>{events_count}</b>"
     ))
 
@@ -635,6 +1398,216 @@ def cmd_set_min_weight(message: types.Message):
     bot.reply_to(message, f"Minimum weight set to <b>{weight}</b>.")
 
 
+@bot.message_handler(commands=["addsource"])
+@ensure_admin(user_id=0)
+def cmd_add_source(message: types.Message):
+    parts = message.text.split(maxsplit=2)
+    if len(parts) < 3 or parts[1].strip().lower() not in ("ics", "json"):
+        bot.reply_to(message, "Usage: /addsource <ics|json> <path_or_url>")
+        return
+    spec = {"type": parts[1].strip().lower(), "location": parts[2].strip()}
+    @with_data
+    def _add(d: Dict[str, Any]) -> bool:
+        sources = d["settings"].setdefault("sources", [{"type": "ctftime"}])
+        if spec in sources:
+            return False
+        sources.append(spec)
+        return True
+    if _add():
+        bot.reply_to(message, f"Added source: <code>{html.escape(source_name(spec))}</code>")
+    else:
+        bot.reply_to(message, f"Source already present: <code>{html.escape(source_name(spec))}</code>")
+
+
+@bot.message_handler(commands=["removesource"])
+@ensure_admin(user_id=0)
+def cmd_remove_source(message: types.Message):
+    parts = message.text.split(maxsplit=1)
+    if len(parts) < 2:
+        bot.reply_to(message, "Usage: /removesource <ctftime|path_or_url>")
+        return
+    target = parts[1].strip()
+    @with_data
+    def _remove(d: Dict[str, Any]) -> Optional[bool]:
+        sources = d["settings"].setdefault("sources", [{"type": "ctftime"}])
+        kept = [s for s in sources if target not in (s.get("location"), source_name(s))]
+        if len(kept) == len(sources):
+            return False
+        if not kept:
+            return None
+        d["settings"]["sources"] = kept
+        return True
+    removed = _remove()
+    if removed:
+        bot.reply_to(message, f"Removed source: <code>{html.escape(target)}</code>")
+    elif removed is None:
+        bot.reply_to(message, "Cannot remove the last source. Add another one with /addsource first.")
+    else:
+        bot.reply_to(message, f"Source not found: <code>{html.escape(target)}</code>")
+
+
+@bot.message_handler(commands=["listsources"])
+@ensure_admin(user_id=0)
+def cmd_list_sources(message: types.Message):
+    with data_lock:
+        d = load_data()
+    sources = d["settings"].get("sources") or [{"type": "ctftime"}]
+    lines = ["<b>Sources</b>"]
+    for s in sources:
+        lines.append(f"• <code>{html.escape(source_name(s))}</code>")
+    bot.reply_to(message, "\n".join(lines))
+
+
+@bot.message_handler(commands=["setreminders"])
+@ensure_admin(user_id=0)
+def cmd_set_reminders(message: types.Message):
+    parts = message.text.split()
+    if len(parts) < 3:
+        bot.reply_to(message, "Usage: /setreminders &lt;id_or_@username&gt; &lt;24h 1h 10m ...|off&gt;")
+        return
+    ch = parts[1].strip()
+    if parts[2].lower() == "off":
+        leads = []
+    else:
+        parsed = [parse_duration_minutes(a) for a in parts[2:]]
+        if None in parsed:
+            bot.reply_to(message, "Durations look like 24h, 1h, 10m or 1d.")
+            return
+        leads = sorted(set(parsed), reverse=True)
+    if not ch.lstrip("-").isdigit():
+        try:
+            ch = str(bot.get_chat(ch if ch.startswith("@") else "@" + ch).id)
+        except ApiTelegramException:
+            bot.reply_to(message, f"Channel not found: <code>{html.escape(parts[1])}</code>")
+            return
+
+    @with_data
+    def _set(d: Dict[str, Any]) -> Optional[int]:
+        if ch not in d["channels"]:
+            return None
+        config = d["settings"].setdefault("channel_reminders", {})
+        if leads:
+            config[ch] = leads
+        else:
+            config.pop(ch, None)
+        n = now_utc()
+        scheduled = 0
+        for event_id, ev_state in d["state"]["events"].items():
+            if ch not in ev_state.get("messages", {}):
+                continue
+            if ev_state.get("status") == "upcoming" and leads:
+                scheduled += schedule_reminders(d, event_id, ch, n)
+            else:
+                cancel_reminders(ev_state, ch)
+        return scheduled
+    scheduled = _set()
+    if scheduled is None:
+        bot.reply_to(message, f"Channel not found: <code>{html.escape(parts[1])}</code>")
+    elif leads:
+        bot.reply_to(message, (
+            f"Reminders for <code>{html.escape(ch)}</code>: <b>{', '.join(fmt_minutes(m) for m in leads)}</b> "
+            f"before start ({scheduled} scheduled)."
+        ))
+    else:
+        bot.reply_to(message, f"Reminders disabled for <code>{html.escape(ch)}</code>.")
+
+
+def describe_subscription(sub: Dict[str, Any]) -> str:
+    leads = sub.get("remind_before", [])
+    return (
+        f"New events: <b>{'on' if sub.get('new_events', True) else 'off'}</b>\n"
+        f"Min weight: <b>{sub.get('min_weight', 0)}</b>\n"
+        f"Remind before: <b>{', '.join(fmt_minutes(m) for m in leads) if leads else 'off'}</b>"
+    )
+
+
+@bot.message_handler(commands=["subscribe"])
+def cmd_subscribe(message: types.Message):
+    if message.chat.type != "private":
+        bot.reply_to(message, "Subscriptions are delivered by DM. Message me privately to subscribe.")
+        return
+    parts = message.text.split(maxsplit=1)
+    min_weight = None
+    if len(parts) > 1:
+        try:
+            min_weight = float(parts[1].strip())
+            # nan/inf would break the sort order of the shared subscription index
+            if not math.isfinite(min_weight):
+                raise ValueError(min_weight)
+        except ValueError:
+            bot.reply_to(message, "Usage: /subscribe [min_weight]")
+            return
+    created = subscribe_user(message.from_user.id, min_weight)
+    with data_lock:
+        sub = load_data().get("subscriptions", {}).get(str(message.from_user.id), {})
+    bot.reply_to(message, (
+        f"{'Subscribed' if created else 'Subscription updated'}. I will DM you about CTFs.\n\n"
+        f"{describe_subscription(sub)}\n\n"
+        "Use /setprefs to change preferences or /unsubscribe to stop."
+    ))
+
+
+@bot.message_handler(commands=["unsubscribe"])
+def cmd_unsubscribe(message: types.Message):
+    if unsubscribe_user(message.from_user.id):
+        bot.reply_to(message, "Unsubscribed. You will no longer receive DMs.")
+    else:
+        bot.reply_to(message, "You are not subscribed.")
+
+
+@bot.message_handler(commands=["prefs"])
+def cmd_prefs(message: types.Message):
+    with data_lock:
+        sub = load_data().get("subscriptions", {}).get(str(message.from_user.id))
+    if sub is None:
+        bot.reply_to(message, "You are not subscribed. Use /subscribe first.")
+        return
+    bot.reply_to(message, f"<b>Your subscription</b>\n{describe_subscription(sub)}")
+
+
+@bot.message_handler(commands=["setprefs"])
+def cmd_set_prefs(message: types.Message):
+    usage = (
+        "Usage:\n"
+        "/setprefs weight &lt;min_weight&gt;\n"
+        "/setprefs before &lt;24h 1h 10m ...|off&gt;\n"
+        "/setprefs new &lt;on|off&gt;"
+    )
+    parts = message.text.split()
+    if len(parts) < 3:
+        bot.reply_to(message, usage)
+        return
+    key, args = parts[1].lower(), parts[2:]
+    changes: Dict[str, Any] = {}
+    if key == "weight":
+        try:
+            changes["min_weight"] = float(args[0])
+            if not math.isfinite(changes["min_weight"]):
+                raise ValueError(args[0])
+        except ValueError:
+            bot.reply_to(message, "Please provide a numeric weight (e.g., 0, 10, 69.5).")
+            return
+    elif key == "before":
+        if args[0].lower() == "off":
+            changes["remind_before"] = []
+        else:
+            leads = [parse_duration_minutes(a) for a in args]
+            if None in leads:
+                bot.reply_to(message, "Durations look like 24h, 1h, 10m or 1d.")
+                return
+            changes["remind_before"] = sorted(set(leads), reverse=True)
+    elif key == "new" and args[0].lower() in ("on", "off"):
+        changes["new_events"] = args[0].lower() == "on"
+    else:
+        bot.reply_to(message, usage)
+        return
+    sub = update_subscription(message.from_user.id, **changes)
+    if sub is None:
+        bot.reply_to(message, "You are not subscribed. Use /subscribe first.")
+        return
+    bot.reply_to(message, f"<b>Preferences updated</b>\n{describe_subscription(sub)}")
+
+
 
 def control_panel_markup(d: Dict[str, Any]) -> types.InlineKeyboardMarkup:
     running = d["state"].get("running", False)
@@ -695,6 +1668,7 @@ def on_control_action(call: types.CallbackQuery):
                 f"Horizon: {s.get('horizon_days', 14)} days\n"
                 f"Min weight: {s.get('min_weight', 0)}\n"
                 f"Disable web preview: {s.get('disable_web_preview', False)}\n"
+                f"Sources: {', '.join(source_name(src) for src in s.get('sources') or [{'type': 'ctftime'}])}\n"
             )
             bot.answer_callback_query(call.id, "OK")
             bot.send_message(call.message.chat.id, f"<b>Settings</b>\n<pre>{html.escape(text)}</pre>")
@@ -702,6 +1676,7 @@ def on_control_action(call: types.CallbackQuery):
 def main():
     print("[INFO] Bot starting. Press Ctrl+C to stop.")
     ensure_scheduler_running()
+    ensure_delivery_running()
                       
     bot.infinity_polling(timeout=60, long_polling_timeout=60)
 